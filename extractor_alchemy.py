@@ -0,0 +1,659 @@
+import sys
+import asyncio
+import aiohttp
+import httpx
+import os
+import json
+import orjson
+import re
+import mimetypes
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, closing
+from itertools import islice
+from pathlib import Path
+from typing import NamedTuple
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlparse, parse_qs
+from dotenv import load_dotenv
+from tenacity import retry, retry_if_exception, retry_if_exception_type, retry_if_not_exception_type, stop_after_attempt, wait_exponential
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Alchemy API Key
+ALCHEMY_API_KEY = os.getenv("ALCHEMY_API_KEY")
+if not ALCHEMY_API_KEY:
+    sys.stderr.write("[ERROR] ALCHEMY_API_KEY not found in .env file\n")
+    sys.exit(1)
+
+# Configuration: Download thumbnails/still images (default: true)
+DOWNLOAD_THUMBNAILS = os.getenv("DOWNLOAD_THUMBNAILS", "true").lower() in ["true", "1", "yes"]
+
+# Configuration: Print [DEBUG] progress lines (default: false)
+DEBUG = os.getenv("DEBUG", "false").lower() in ["true", "1", "yes"]
+
+# Only this module's logger writes to stdout, so importers and third-party libraries keep their own logging setup
+log = logging.getLogger(__name__)
+_log_handler = logging.StreamHandler(sys.stdout)
+_log_handler.setFormatter(logging.Formatter("[%(levelname)s] %(message)s"))
+log.addHandler(_log_handler)
+log.setLevel(logging.DEBUG if DEBUG else logging.INFO)
+log.propagate = False
+
+# httpx logs every request URL at INFO, and the Alchemy URL carries the API key; httpcore/hpack flood DEBUG
+for _name in ("httpx", "httpcore", "hpack"):
+    logging.getLogger(_name).setLevel(logging.WARNING)
+
+def redact_key(text):
+    """Hide the API key in messages built from request URLs (e.g. httpx.HTTPStatusError)"""
+    return str(text).replace(ALCHEMY_API_KEY, "***")
+
+# Maximum number of in-flight Alchemy requests
+MAX_CONCURRENT_REQUESTS = 64
+
+def alchemy_client():
+    """HTTP/2 client for Alchemy API calls, so concurrent batches share one connection"""
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=MAX_CONCURRENT_REQUESTS, max_keepalive_connections=32),
+        timeout=30,
+    )
+
+# Maximum number of HTTP listener requests extracted at the same time
+MAX_LISTENER_WORKERS = 32
+
+# Maximum number of tokens per getNFTMetadataBatch call (Alchemy limit is 100)
+BATCH_SIZE = 100
+
+# Media downloads can be tens of MB: no overall deadline, only a stalled-read timeout
+DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=60)
+DOWNLOAD_CHUNK_SIZE = 65536
+
+# Transient HTTP statuses worth retrying (rate limiting and server errors)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+def log_retry(retry_state):
+    sys.stdout.write(f"[WARN] Attempt {retry_state.attempt_number} failed ({redact_key(retry_state.outcome.exception())}), retrying in {retry_state.next_action.sleep:.1f}s\n")
+    sys.stdout.flush()
+
+# Errors worth another attempt: dropped connections, truncated bodies and timeouts
+TRANSIENT_ERRORS = (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, httpx.TransportError, asyncio.TimeoutError)
+# Bad URLs (e.g. ipfs:// that was never rewritten) and certificate failures fail the same way every time
+PERMANENT_ERRORS = (aiohttp.InvalidURL, aiohttp.ClientSSLError, httpx.UnsupportedProtocol)
+
+def is_retry_status(error):
+    """True for the RETRY_STATUSES responses raised on purpose (not redirects or content-type errors)"""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status in RETRY_STATUSES
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRY_STATUSES
+    return False
+
+# Retry transient errors with exponential back-off; permanent ones fail on the first attempt
+network_retry = retry(
+    stop=stop_after_attempt(5),
+    wait=wait_exponential(multiplier=1, max=30),
+    retry=(retry_if_exception_type(TRANSIENT_ERRORS) | retry_if_exception(is_retry_status)) & retry_if_not_exception_type(PERMANENT_ERRORS),
+    before_sleep=log_retry,
+    reraise=True,
+)
+
+# Configuration: How long fetched metadata stays valid in the on-disk cache (default: 24h)
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "86400"))
+
+# Create directory for artwork and metadata if it doesn't exist
+ARTWORK = Path("artwork")
+ARTWORK.mkdir(exist_ok=True)
+
+# Metadata cache lives next to the artwork it describes
+CACHE_PATH = ARTWORK / "metadata-cache.sqlite"
+
+# Patterns used on every token, compiled once
+_EXT_RE = re.compile(r"\.[a-zA-Z0-9]{2,5}$")
+_DELETE_TABLE = str.maketrans('', '', '<>:"/\\|?*')
+_MULTI_HYPHEN = re.compile(r'-+')
+
+def has_extension(url):
+    path = url.split("?")[0]  # remove query params
+    return bool(_EXT_RE.search(path))
+
+def get_extension(url, fmt):
+    path = url.split("?")[0]
+    if has_extension(path):
+        return os.path.splitext(path)[1]
+    if fmt:
+        return extension_from_mime(normalize_mime(fmt))
+    return ""
+
+def _snapshot_mimetypes():
+    """Snapshot the mimetypes database as {mime_type: extension}"""
+    if not mimetypes.inited:
+        mimetypes.init()  # loads the system mime.types files into types_map
+    snapshot = {}
+    for mime_type in set(mimetypes.types_map.values()):
+        ext = mimetypes.guess_extension(mime_type)
+        if ext:
+            snapshot[mime_type.lower()] = '.jpg' if ext == '.jpe' else ext  # normalize uncommon .jpe
+    return snapshot
+
+# Built once so each lookup is a single dict access
+MIME_TO_EXT = {
+    **_snapshot_mimetypes(),
+    # Explicit mappings for missing or inconsistent mimetypes
+    'image/webp': '.webp',
+    'video/webm': '.webm',
+    'image/jpg': '.jpg',
+    'image/jpeg': '.jpg',
+}
+
+# Short format names (e.g. media[0].format) to mime types
+SHORT_TO_MIME = {
+    'jpg': 'image/jpeg',
+    'jpeg': 'image/jpeg',
+    'png': 'image/png',
+    'gif': 'image/gif',
+    'webp': 'image/webp',
+    'svg': 'image/svg+xml',
+    'bmp': 'image/bmp',
+}
+
+def normalize_mime(fmt):
+    fmt = fmt.lower().strip()
+    if '/' in fmt:
+        return fmt
+    return SHORT_TO_MIME.get(fmt, f'image/{fmt}')
+
+def extension_from_mime(mime_type):
+    return MIME_TO_EXT.get(mime_type, '')
+
+def sanitize_filename(name):
+    """Convert a string to a safe filename by replacing spaces and special chars"""
+    # Replace spaces with hyphens
+    name = name.replace(' ', '-')
+    # Remove or replace characters that are unsafe for filenames
+    name = name.translate(_DELETE_TABLE)
+    # Replace multiple hyphens with single hyphen
+    name = _MULTI_HYPHEN.sub('-', name)
+    # Remove leading/trailing hyphens
+    name = name.strip('-')
+    return name
+
+class DownloadSessions(NamedTuple):
+    """aiohttp sessions for media downloads, split by whether SSL certificates are verified"""
+    ipfs: aiohttp.ClientSession
+    https: aiohttp.ClientSession
+
+    def for_url(self, url):
+        # Disable SSL verification for IPFS URLs (certificates often expire)
+        return self.ipfs if url.startswith('https://ipfs.') else self.https
+
+@asynccontextmanager
+async def open_download_sessions():
+    """Yield DownloadSessions whose connection pools and SSL settings are set up once per run"""
+    def make_session(verify_ssl):
+        connector = aiohttp.TCPConnector(limit_per_host=MAX_CONCURRENT_REQUESTS, ssl=verify_ssl)
+        return aiohttp.ClientSession(connector=connector)
+
+    async with make_session(verify_ssl=False) as ipfs, make_session(verify_ssl=True) as https:
+        yield DownloadSessions(ipfs=ipfs, https=https)
+
+# Output files being downloaded and token base filenames being saved, shared by every run in the process
+# (listener threads included)
+_downloads_in_progress = set()
+_downloads_lock = threading.Lock()
+
+def claim_download(file_path):
+    """Mark `file_path` as being written. Returns False if another download or token already claimed it."""
+    with _downloads_lock:
+        if file_path in _downloads_in_progress:
+            return False
+        _downloads_in_progress.add(file_path)
+        return True
+
+def release_download(file_path):
+    with _downloads_lock:
+        _downloads_in_progress.discard(file_path)
+
+def unique_temp_path(path, suffix):
+    """Temp file next to `path` that no other writer uses, so concurrent writes to the same target can't mix"""
+    return path.with_name(f"{path.name}.{uuid.uuid4().hex}{suffix}")
+
+async def download_file(sessions, url, base_filename, fmt=None, overwrite=False):
+    if not url:
+        return
+    try:
+        log.debug("Downloading from %s", url)
+
+        extension = get_extension(url, fmt)
+        file_path = ARTWORK / f"{base_filename}{extension}"
+
+        # Two tokens (or two overlapping listener requests) can resolve to the same file
+        if not claim_download(file_path):
+            sys.stdout.write(f"[INFO] File already being downloaded, skipping: {file_path}\n")
+            sys.stdout.flush()
+            return
+
+        try:
+            if not overwrite and file_path.exists() and file_path.stat().st_size > 0:
+                sys.stdout.write(f"[INFO] File already exists, skipping download: {file_path}\n")
+                sys.stdout.flush()
+                return
+
+            if await stream_to_file(sessions.for_url(url), url, file_path):
+                sys.stdout.write(f"[INFO] File saved to {file_path}\n")
+            else:
+                sys.stdout.write(f"[ERROR] Failed to download from {url}\n")
+        finally:
+            release_download(file_path)
+    except Exception as e:
+        sys.stdout.write(f"[EXCEPTION] Error downloading file: {e}\n")
+    sys.stdout.flush()
+
+@network_retry
+async def stream_to_file(session, url, file_path):
+    """Stream `url` into `file_path`. Returns False for non-retryable error statuses."""
+    async with session.get(url, timeout=DOWNLOAD_TIMEOUT) as response:
+        if response.status in RETRY_STATUSES:
+            response.raise_for_status()
+        if response.status != 200:
+            return False
+        # Stream to a partial file so large video/gif files are never held in memory,
+        # and an interrupted download never looks like a finished one on the next run
+        partial_path = unique_temp_path(file_path, ".part")
+        try:
+            with open(partial_path, "xb") as file:
+                async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                    file.write(chunk)
+            os.replace(partial_path, file_path)
+        finally:
+            partial_path.unlink(missing_ok=True)
+        return True
+
+def dump_json(data, indent=False):
+    """Serialize to UTF-8 JSON bytes with orjson, falling back to json for integers wider than 64 bits"""
+    try:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    except orjson.JSONEncodeError:
+        return json.dumps(data, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+def prefer_alchemy_gateway(media_item):
+    """Prefer Alchemy gateway URL over raw IPFS URLs"""
+    if media_item.get("gateway"):
+        return media_item.get("gateway")
+    return media_item.get("raw")
+
+def resource_basename(metadata, token_id):
+    """Base filename shared by all of a token's files: the NFT name, falling back to title or token ID"""
+    nft_name = metadata.get("metadata", {}).get("name", metadata.get("title", f"token-{token_id}"))
+    base_filename = sanitize_filename(nft_name)
+    log.debug("Using base filename: %s", base_filename)
+    return base_filename
+
+def primary_media(metadata):
+    """Return (url, mime type) of the primary media in metadata.media.uri, or (None, None)"""
+    nested_media = metadata.get("metadata", {}).get("media", {})
+    if isinstance(nested_media, dict) and nested_media.get("uri"):
+        return nested_media.get("uri"), nested_media.get("mimeType", "")
+    return None, None
+
+def primary_downloads(sessions, metadata, base_filename, overwrite=False):
+    """Download coroutines for the primary media (often the full-res file)"""
+    primary_url, primary_mime = primary_media(metadata)
+    if not primary_url:
+        return []
+    log.debug("Found primary media in metadata.media.uri: %s", primary_url)
+    return [download_file(sessions, primary_url, base_filename, fmt=primary_mime, overwrite=overwrite)]
+
+def thumbnail_downloads(sessions, metadata, base_filename, overwrite=False):
+    """Download coroutines for the thumbnail in the top-level media array, unless it duplicates the primary media"""
+    top_level_media = metadata.get("media", [])
+    if not top_level_media:
+        return []
+    media_item = top_level_media[0]
+    gateway_url = prefer_alchemy_gateway(media_item)
+    fmt = media_item.get("format")
+    if not gateway_url:
+        return []
+
+    # Check if this is likely a duplicate of the primary media
+    primary_url, primary_mime = primary_media(metadata)
+    is_duplicate = False
+    if primary_url:
+        # If URLs are similar or if both exist in metadata, assume duplicate
+        if primary_url in gateway_url or gateway_url in primary_url:
+            is_duplicate = True
+        # Primary and thumbnail download concurrently, so they must not share a file
+        if get_extension(gateway_url, fmt) == get_extension(primary_url, primary_mime):
+            is_duplicate = True
+
+    if is_duplicate:
+        sys.stdout.write(f"[INFO] Skipping duplicate thumbnail (same as primary media)\n")
+        sys.stdout.flush()
+        return []
+    # Download thumbnail with same base name (extension will differentiate)
+    return [download_file(sessions, gateway_url, base_filename, fmt=fmt, overwrite=overwrite)]
+
+def write_atomic(path, data):
+    """Write bytes to a temporary file, then move it into place so readers never see a partial file"""
+    tmp_path = unique_temp_path(path, ".tmp")
+    try:
+        with open(tmp_path, "xb") as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+async def file_writer(write_queue):
+    """Single consumer for metadata writes, so concurrent tokens don't contend on the filesystem"""
+    while True:
+        path, data, label = await write_queue.get()
+        try:
+            await asyncio.to_thread(write_atomic, path, data)
+            sys.stdout.write(f"[INFO] {label} saved to {path}\n")
+        except Exception as e:
+            sys.stdout.write(f"[EXCEPTION] Error writing {path}: {e}\n")
+        finally:
+            sys.stdout.flush()
+            write_queue.task_done()
+
+@asynccontextmanager
+async def open_file_writer():
+    """Run a file_writer task for the duration of the block and yield its queue of (path, bytes, label)"""
+    write_queue = asyncio.Queue(maxsize=MAX_CONCURRENT_REQUESTS)
+    writer_task = asyncio.create_task(file_writer(write_queue))
+    try:
+        yield write_queue
+    finally:
+        await write_queue.join()
+        writer_task.cancel()
+
+async def save_metadata_files(write_queue, metadata, base_filename):
+    """Queue the complete token JSON and the simplified metadata JSON for writing"""
+    # Save full token metadata JSON with -token suffix
+    await write_queue.put((ARTWORK / f"{base_filename}-token.json", dump_json(metadata, indent=True), "Token metadata"))
+
+    # Extract and save simplified metadata from metadata section
+    simplified_metadata = {}
+    metadata_section = metadata.get("metadata", {})
+
+    if metadata_section.get("name"):
+        simplified_metadata["name"] = metadata_section.get("name")
+    if metadata_section.get("description"):
+        simplified_metadata["description"] = metadata_section.get("description")
+    if metadata_section.get("tags"):
+        simplified_metadata["tags"] = metadata_section.get("tags")
+    if metadata_section.get("createdBy"):
+        simplified_metadata["createdBy"] = metadata_section.get("createdBy")
+    if metadata_section.get("yearCreated"):
+        simplified_metadata["yearCreated"] = metadata_section.get("yearCreated")
+
+    # Save simplified metadata JSON
+    await write_queue.put((ARTWORK / f"{base_filename}.json", dump_json(simplified_metadata), "Simplified metadata"))
+
+def saved_token_matches(base_filename, contract_address, token_id):
+    """True if the files already saved under `base_filename` belong to this token, judged by its -token.json"""
+    try:
+        with open(ARTWORK / f"{base_filename}-token.json", "rb") as file:
+            saved = json.loads(file.read())
+    except (OSError, ValueError):
+        return False
+    saved_contract = (saved.get("contract") or {}).get("address") or ""
+    return saved_contract.lower() == contract_address.lower() and returned_token_key(saved) == cache_key(token_id)
+
+def claim_basename(base_filename, token_id):
+    """Claim a token's base filename; two tokens with the same name (e.g. an edition series) must not mix files"""
+    if claim_download(ARTWORK / base_filename):
+        return True
+    sys.stdout.write(f"[WARN] Another token is saving files named {base_filename}, skipping Token ID {token_id}\n")
+    sys.stdout.flush()
+    return False
+
+async def _save_with_thumb(sessions, write_queue, metadata, token_id, contract_address):
+    try:
+        log.debug("Saving metadata for Token ID: %s", token_id)
+        base_filename = resource_basename(metadata, token_id)
+        if not claim_basename(base_filename, token_id):
+            return
+        try:
+            # Existing media is only reused if it was saved for this token, so media and JSON always match
+            overwrite = not await asyncio.to_thread(saved_token_matches, base_filename, contract_address, token_id)
+            await asyncio.gather(
+                *primary_downloads(sessions, metadata, base_filename, overwrite),
+                *thumbnail_downloads(sessions, metadata, base_filename, overwrite),
+            )
+            await save_metadata_files(write_queue, metadata, base_filename)
+        finally:
+            release_download(ARTWORK / base_filename)
+    except Exception as e:
+        sys.stdout.write(f"[EXCEPTION] Error saving resources for Token ID {token_id}: {e}\n")
+    sys.stdout.flush()
+
+async def _save_no_thumb(sessions, write_queue, metadata, token_id, contract_address):
+    try:
+        log.debug("Saving metadata for Token ID: %s", token_id)
+        base_filename = resource_basename(metadata, token_id)
+        sys.stdout.write(f"[INFO] Skipping thumbnail download (DOWNLOAD_THUMBNAILS=false)\n")
+        if not claim_basename(base_filename, token_id):
+            return
+        try:
+            overwrite = not await asyncio.to_thread(saved_token_matches, base_filename, contract_address, token_id)
+            await asyncio.gather(*primary_downloads(sessions, metadata, base_filename, overwrite))
+            await save_metadata_files(write_queue, metadata, base_filename)
+        finally:
+            release_download(ARTWORK / base_filename)
+    except Exception as e:
+        sys.stdout.write(f"[EXCEPTION] Error saving resources for Token ID {token_id}: {e}\n")
+    sys.stdout.flush()
+
+# Pick the variant once instead of checking DOWNLOAD_THUMBNAILS for every token
+save_all_resources = _save_with_thumb if DOWNLOAD_THUMBNAILS else _save_no_thumb
+
+def chunked(iterable, size):
+    """Yield successive lists of at most `size` items from `iterable`"""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+def cache_key(token_id):
+    """Normalize a token ID (int, decimal string or 0x-prefixed hex string) for use as a cache key"""
+    if isinstance(token_id, str) and token_id.lower().startswith("0x"):
+        return str(int(token_id, 16))
+    return str(int(token_id))
+
+def returned_token_key(metadata):
+    """Cache key for the token a batch result describes (v2 reports id.tokenId as hex), or None if it has no ID"""
+    token_id = ((metadata or {}).get("id") or {}).get("tokenId")
+    try:
+        return cache_key(token_id) if token_id is not None else None
+    except ValueError:
+        return None
+
+def open_metadata_cache():
+    conn = sqlite3.connect(CACHE_PATH)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS cache("
+        "contract TEXT, token TEXT, json TEXT, fetched_at INTEGER, "
+        "PRIMARY KEY(contract, token))"
+    )
+    return conn
+
+def read_metadata_cache(contract_address, token_ids):
+    """Return {cache_key: metadata} for tokens fetched within CACHE_TTL_SECONDS"""
+    keys = [cache_key(token_id) for token_id in token_ids]
+    if not keys:
+        return {}
+    try:
+        placeholders = ",".join("?" * len(keys))
+        query = f"SELECT token, json FROM cache WHERE contract = ? AND fetched_at > ? AND token IN ({placeholders})"
+        with closing(open_metadata_cache()) as conn:
+            rows = conn.execute(query, [contract_address.lower(), int(time.time()) - CACHE_TTL_SECONDS, *keys]).fetchall()
+        return {token: json.loads(data) for token, data in rows}
+    except Exception as e:
+        sys.stdout.write(f"[EXCEPTION] Error reading metadata cache: {e}\n")
+        sys.stdout.flush()
+        return {}
+
+def write_metadata_cache(contract_address, metadata_by_key):
+    """Store {cache_key: metadata}, skipping tokens Alchemy reported an error for"""
+    now = int(time.time())
+    rows = [
+        (contract_address.lower(), key, json.dumps(metadata), now)
+        for key, metadata in metadata_by_key.items()
+        if metadata and not metadata.get("error")
+    ]
+    try:
+        with closing(open_metadata_cache()) as conn, conn:
+            conn.executemany("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)", rows)
+    except Exception as e:
+        sys.stdout.write(f"[EXCEPTION] Error writing metadata cache: {e}\n")
+        sys.stdout.flush()
+
+@network_retry
+async def post_metadata_batch(client, url, payload):
+    """POST a batch request and return the decoded JSON response, or None for non-retryable error statuses"""
+    response = await client.post(url, json=payload)
+    if response.status_code in RETRY_STATUSES:
+        response.raise_for_status()
+    if response.status_code == 200:
+        return response.json()
+    sys.stdout.write(f"[ERROR] Failed to fetch metadata batch. Status: {response.status_code}\n")
+    sys.stdout.flush()
+    return None
+
+async def request_metadata_batch(client, contract_address, token_ids):
+    """Request metadata for up to BATCH_SIZE tokens of one contract in a single call.
+
+    Returns the list of token metadata from the response, or None on failure.
+    """
+    try:
+        url = f"https://eth-mainnet.g.alchemy.com/nft/v2/{ALCHEMY_API_KEY}/getNFTMetadataBatch"
+        payload = {
+            "tokens": [{"contractAddress": contract_address, "tokenId": str(token_id)} for token_id in token_ids],
+            "refreshCache": False,
+        }
+        return await post_metadata_batch(client, url, payload)
+    except Exception as e:
+        sys.stdout.write(f"[EXCEPTION] Error fetching metadata batch: {redact_key(e)}\n")
+    sys.stdout.flush()
+    return None
+
+async def fetch_metadata_batch(client, contract_address, token_ids):
+    """Fetch metadata for tokens of one contract, only requesting those missing from the cache.
+
+    Returns a list in the same order as `token_ids`, with None for tokens that could not be fetched.
+    """
+    # sqlite calls block, so keep them off the event loop shared with in-flight downloads
+    metadata_by_key = await asyncio.to_thread(read_metadata_cache, contract_address, token_ids)
+    missing = [token_id for token_id in token_ids if cache_key(token_id) not in metadata_by_key]
+    if len(missing) < len(token_ids):
+        sys.stdout.write(f"[INFO] Metadata cache hit for {len(token_ids) - len(missing)} of {len(token_ids)} tokens\n")
+        sys.stdout.flush()
+
+    if missing:
+        fetched = await request_metadata_batch(client, contract_address, missing)
+        if fetched:
+            # Match results on the token ID they report rather than their position in the response;
+            # requested tokens with no matching result stay missing
+            requested = set(map(cache_key, missing))
+            fetched_by_key = {}
+            for metadata in fetched:
+                key = returned_token_key(metadata)
+                if key in requested:
+                    fetched_by_key[key] = metadata
+            await asyncio.to_thread(write_metadata_cache, contract_address, fetched_by_key)
+            metadata_by_key.update(fetched_by_key)
+
+    return [metadata_by_key.get(cache_key(token_id)) for token_id in token_ids]
+
+async def browse_nfts(contract_address, start_id, end_id):
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    async def bounded_fetch(token_ids):
+        async with sem:
+            return await fetch_metadata_batch(client, contract_address, token_ids)
+
+    async def bounded_save(metadata, token_id):
+        async with sem:
+            await save_all_resources(sessions, write_queue, metadata, token_id, contract_address)
+
+    async with alchemy_client() as client, open_download_sessions() as sessions, open_file_writer() as write_queue:
+        batches = list(chunked(range(start_id, end_id + 1), BATCH_SIZE))
+        tasks = [bounded_fetch(token_ids) for token_ids in batches]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        saves = []
+        for token_ids, batch_metadata in zip(batches, results):
+            if isinstance(batch_metadata, Exception):
+                sys.stdout.write(f"[EXCEPTION] Error fetching metadata for Token IDs {token_ids[0]}-{token_ids[-1]}: {batch_metadata}\n")
+                sys.stdout.flush()
+                continue
+            if not batch_metadata:
+                continue
+            saves.extend(bounded_save(metadata, token_id) for token_id, metadata in zip(token_ids, batch_metadata) if metadata)
+        # Media downloads dominate once metadata is batched, so save tokens concurrently like the sheet path does
+        await asyncio.gather(*saves)
+
+def parse_token_id(value):
+    try:
+        return int(value, 16) if value.startswith("0x") else int(value)
+    except ValueError:
+        return None
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer that handles each request on a bounded thread pool, so one long extraction doesn't block the rest"""
+
+    def __init__(self, server_address, handler_class, max_workers=MAX_LISTENER_WORKERS):
+        super().__init__(server_address, handler_class)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self.process_request_thread, request, client_address)
+
+    def process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=True)
+
+def start_http_listener():
+    class RequestHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            sys.stdout.write(f"[HTTP LOG] {self.client_address[0]} - {format % args}\n")
+            sys.stdout.flush()
+
+        def do_GET(self):
+            parsed_url = urlparse(self.path)
+            query_params = parse_qs(parsed_url.query)
+            contract_address = query_params.get("NFT_CONTRACT_ADDRESS", [None])[0]
+            first_token_id = query_params.get("FIRST_TOKEN_ID", [None])[0]
+            last_token_id = query_params.get("LAST_TOKEN_ID", [first_token_id])[0]
+
+            start_id = parse_token_id(first_token_id)
+            end_id = parse_token_id(last_token_id)
+
+            if contract_address and start_id is not None and end_id is not None:
+                asyncio.run(browse_nfts(contract_address, start_id, end_id))
+                self.send_response(200)
+            else:
+                self.send_response(400)
+                self.wfile.write(b"Invalid request. Provide NFT_CONTRACT_ADDRESS and FIRST_TOKEN_ID.\n")
+            self.end_headers()
+
+    server = PooledHTTPServer(('localhost', 3128), RequestHandler)
+    sys.stdout.write("[INFO] HTTP listener started on port 3128\n")
+    sys.stdout.flush()
+    server.serve_forever()
+
+if __name__ == "__main__":
+    start_http_listener()
@@ -1,23 +1,53 @@
 import sys
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import argparse
 import re
 import csv
-from io import StringIO
+from io import TextIOWrapper
+from itertools import islice
 from urllib.parse import urlparse, parse_qs
 
 # Import from the main extractor
-from dotenv import load_dotenv
-import os
-import json
-
-# Load environment variables
-load_dotenv()
-ALCHEMY_API_KEY = os.getenv("ALCHEMY_API_KEY")
-
-if not ALCHEMY_API_KEY:
-    sys.stderr.write("[ERROR] ALCHEMY_API_KEY not found in .env file\n")
-    sys.exit(1)
+from extractor_alchemy import (
+    BATCH_SIZE,
+    alchemy_client,
+    chunked,
+    fetch_metadata_batch,
+    open_download_sessions,
+    open_file_writer,
+    save_all_resources,
+)
+
+# Shared session so keep-alive connections (and TLS handshakes) are reused across requests
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(
+        total=5,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=['GET', 'POST'],
+        respect_retry_after_header=True,
+    ),
+))
+
+# (connect, read) timeout in seconds for every request
+REQUEST_TIMEOUT = (5, 30)
+
+# Maximum number of NFTs fetched/saved at the same time
+MAX_CONCURRENT_ROWS = 32
+
+# NFT URL patterns, compiled once since every cell of every row is checked
+_OPENSEA_RE = re.compile(r'/assets/(?:ethereum|eth)/([0-9a-fA-Fx]+)/(\d+)')
+_RARIBLE_RE = re.compile(r'/token/([0-9a-fA-Fx]+):(\d+)')
+_DIRECT_RE = re.compile(r'(0x[0-9a-fA-F]{40})[/:]+(\d+)')
+_SEPARATOR_RE = re.compile(r'[,\s]+')
+_CONTRACT_RE = re.compile(r'(0x[0-9a-fA-F]{40})')
+_TOKEN_RE = re.compile(r'(\d+)')
 
 
 def convert_to_csv_url(sheets_url):
@@ -55,14 +85,16 @@ def convert_to_csv_url(sheets_url):
 
 
 def fetch_csv_data(csv_url):
-    """Fetch CSV data from Google Sheets export URL"""
+    """Open a streaming text reader over the CSV data at a Google Sheets export URL"""
     sys.stdout.write(f"[INFO] Fetching data from: {csv_url}\n")
     sys.stdout.flush()
 
     try:
-        response = requests.get(csv_url)
+        response = SESSION.get(csv_url, timeout=REQUEST_TIMEOUT, stream=True)
         if response.status_code == 200:
-            return response.text
+            # Decode the body as it arrives; newline='' lets csv handle quoted line breaks
+            response.raw.decode_content = True
+            return TextIOWrapper(response.raw, encoding=response.encoding or "utf-8", newline="")
         else:
             sys.stderr.write(f"[ERROR] Failed to fetch CSV. Status code: {response.status_code}\n")
             sys.exit(1)
@@ -86,25 +118,25 @@ def parse_nft_url(url):
     url = url.strip()
 
     # Pattern 1: OpenSea format - /assets/ethereum/CONTRACT/TOKEN
-    opensea_match = re.search(r'/assets/(?:ethereum|eth)/([0-9a-fA-Fx]+)/(\d+)', url)
+    opensea_match = _OPENSEA_RE.search(url)
     if opensea_match:
         return opensea_match.group(1), opensea_match.group(2)
 
     # Pattern 2: Rarible format - /token/CONTRACT:TOKEN
-    rarible_match = re.search(r'/token/([0-9a-fA-Fx]+):(\d+)', url)
+    rarible_match = _RARIBLE_RE.search(url)
     if rarible_match:
         return rarible_match.group(1), rarible_match.group(2)
 
     # Pattern 3: Direct format - CONTRACT/TOKEN or CONTRACT:TOKEN
-    direct_match = re.search(r'(0x[0-9a-fA-F]{40})[/:]+(\d+)', url)
+    direct_match = _DIRECT_RE.search(url)
     if direct_match:
         return direct_match.group(1), direct_match.group(2)
 
     # Pattern 4: Just a contract address and token on same line separated by whitespace or comma
-    parts = re.split(r'[,\s]+', url)
+    parts = _SEPARATOR_RE.split(url)
     if len(parts) >= 2:
-        contract_match = re.match(r'(0x[0-9a-fA-F]{40})', parts[0])
-        token_match = re.match(r'(\d+)', parts[1])
+        contract_match = _CONTRACT_RE.match(parts[0])
+        token_match = _TOKEN_RE.match(parts[1])
         if contract_match and token_match:
             return contract_match.group(1), token_match.group(1)
 
@@ -113,112 +145,138 @@ def parse_nft_url(url):
     return None, None
 
 
-def fetch_metadata(contract_address, token_id):
-    """Fetch NFT metadata from Alchemy API"""
-    try:
-        url = f"https://eth-mainnet.g.alchemy.com/nft/v2/{ALCHEMY_API_KEY}/getNFTMetadata?contractAddress={contract_address}&tokenId={token_id}&refreshCache=false"
-        response = requests.get(url)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            sys.stdout.write(f"[ERROR] Failed to fetch metadata for {contract_address}/{token_id}. Status: {response.status_code}\n")
-    except Exception as e:
-        sys.stdout.write(f"[EXCEPTION] Error fetching metadata: {e}\n")
-    sys.stdout.flush()
-    return None
+async def process_one(sem, sessions, write_queue, row_num, contract_address, token_id, metadata):
+    """Save the resources of one fetched NFT. Returns True if it was processed."""
+    if not metadata:
+        sys.stdout.write(f"[ERROR] Row {row_num}: Failed to fetch metadata\n")
+        sys.stdout.flush()
+        return False
 
+    async with sem:
+        sys.stdout.write(f"\n[INFO] Row {row_num}: Processing {contract_address}/{token_id}\n")
+        sys.stdout.flush()
+        await save_all_resources(sessions, write_queue, metadata, int(token_id), contract_address)
+    return True
 
-def process_rows(csv_data, start_row=1, count=None):
+
+async def process_batch(sem, client, sessions, write_queue, contract_address, batch):
     """
-    Process rows from CSV data.
+    Fetch metadata for one batch of a contract's tokens, then save them concurrently.
 
     Args:
-        csv_data: CSV content as string
-        start_row: Row number to start from (1-indexed, header is row 1)
-        count: Maximum number of valid NFTs to process (None = all)
+        batch: List of (row_num, token_id) for a single contract, at most BATCH_SIZE long
+
+    Returns:
+        List of booleans, one per entry in batch, True if processed
     """
-    # Import save function from main extractor
-    from importlib import import_module
-    extractor = import_module('extractor-alchemy')
+    token_ids = [token_id for _, token_id in batch]
+    async with sem:
+        sys.stdout.write(f"\n[INFO] Fetching metadata for {len(token_ids)} tokens from {contract_address}\n")
+        sys.stdout.flush()
+        batch_metadata = await fetch_metadata_batch(client, contract_address, token_ids)
 
-    csv_reader = csv.reader(StringIO(csv_data))
-    rows = list(csv_reader)
+    return await asyncio.gather(*(
+        process_one(sem, sessions, write_queue, row_num, contract_address, token_id, metadata)
+        for (row_num, token_id), metadata in zip(batch, batch_metadata)
+    ))
 
-    if not rows:
-        sys.stdout.write("[WARN] No rows found in spreadsheet\n")
-        return
 
-    sys.stdout.write(f"[INFO] Found {len(rows)} total rows in spreadsheet\n")
-    sys.stdout.flush()
+async def process_rows(csv_data, start_row=1, count=None):
+    """
+    Process rows from CSV data.
 
+    Args:
+        csv_data: Iterable of CSV lines (e.g. the stream returned by fetch_csv_data)
+        start_row: Row number to start from (1-indexed, header is row 1)
+        count: Maximum number of unique NFTs to queue for fetching (None = all); failed fetches are not replaced
+    """
     # Adjust for 0-indexing (user provides 1-indexed row numbers)
     start_idx = start_row - 1
     if start_idx < 0:
         start_idx = 0
 
     if count is not None:
-        sys.stdout.write(f"[INFO] Will process {count} valid NFTs starting from row {start_row}\n")
+        sys.stdout.write(f"[INFO] Will queue up to {count} unique NFTs starting from row {start_row}\n")
     else:
         sys.stdout.write(f"[INFO] Will process all valid NFTs starting from row {start_row}\n")
     sys.stdout.flush()
 
     processed_count = 0
     skipped_count = 0
-    current_row_idx = start_idx
-
-    # Continue processing rows until we've processed enough valid NFTs or run out of rows
-    while current_row_idx < len(rows):
+    queued_count = 0
+    rows_read = 0
+    nfts_by_contract = {}
+    seen = set()
+
+    # Collect NFTs per contract until we've queued enough valid NFTs or run out of rows
+    csv_reader = csv.reader(csv_data)
+    for row_num, row in enumerate(islice(csv_reader, start_idx, None), start=start_idx + 1):
         # If we've reached our count limit, stop
-        if count is not None and processed_count >= count:
+        if count is not None and queued_count >= count:
             break
-
-        idx = current_row_idx
-        current_row_idx += 1
-        row = rows[idx]
+        rows_read += 1
 
         # Skip empty rows
         if not row or all(cell.strip() == '' for cell in row):
-            sys.stdout.write(f"[INFO] Skipping empty row {idx + 1}\n")
+            sys.stdout.write(f"[INFO] Skipping empty row {row_num}\n")
             sys.stdout.flush()
             skipped_count += 1
             continue
 
-        # Try to find NFT URL in any column
-        nft_url = None
+        # Try to find NFT URL in any column, keeping the first successful parse
+        contract_address = token_id = None
         for cell in row:
             if cell and cell.strip():
                 # Check if this cell contains a URL or contract/token info
                 contract, token = parse_nft_url(cell)
                 if contract and token:
-                    nft_url = cell
+                    contract_address, token_id = contract, token
                     break
 
-        if not nft_url:
-            sys.stdout.write(f"[WARN] Row {idx + 1}: No valid NFT URL found: {row}\n")
+        if not contract_address or not token_id:
+            sys.stdout.write(f"[WARN] Row {row_num}: No valid NFT URL found: {row}\n")
             sys.stdout.flush()
             skipped_count += 1
             continue
 
-        contract_address, token_id = parse_nft_url(nft_url)
-
-        if not contract_address or not token_id:
-            sys.stdout.write(f"[WARN] Row {idx + 1}: Could not parse NFT info from: {nft_url}\n")
+        # Skip NFTs already queued from an earlier row (addresses are case-insensitive)
+        nft_key = (contract_address.lower(), int(token_id))
+        if nft_key in seen:
+            sys.stdout.write(f"[INFO] Row {row_num}: Skipping duplicate {contract_address}/{token_id}\n")
             sys.stdout.flush()
             skipped_count += 1
             continue
+        seen.add(nft_key)
 
-        sys.stdout.write(f"\n[INFO] Row {idx + 1}: Processing {contract_address}/{token_id}\n")
+        sys.stdout.write(f"[INFO] Row {row_num}: Queued {contract_address}/{token_id}\n")
         sys.stdout.flush()
+        # Group on the normalized address so checksummed and lowercase rows share one batch call
+        nfts_by_contract.setdefault(nft_key[0], []).append((row_num, token_id))
+        queued_count += 1
 
-        # Fetch and save NFT data
-        metadata = fetch_metadata(contract_address, token_id)
-        if metadata:
-            extractor.save_all_resources(metadata, int(token_id), contract_address)
-            processed_count += 1
-        else:
-            sys.stdout.write(f"[ERROR] Row {idx + 1}: Failed to fetch metadata\n")
+    if not rows_read:
+        sys.stdout.write("[WARN] No rows found in spreadsheet\n")
+        return
+
+    # Fetch metadata in batches per contract and save NFT data, with bounded concurrency
+    batches = [
+        (contract_address, batch)
+        for contract_address, entries in nfts_by_contract.items()
+        for batch in chunked(entries, BATCH_SIZE)
+    ]
+    sem = asyncio.Semaphore(MAX_CONCURRENT_ROWS)
+    async with alchemy_client() as client, open_download_sessions() as sessions, open_file_writer() as write_queue:
+        tasks = [process_batch(sem, client, sessions, write_queue, contract_address, batch) for contract_address, batch in batches]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    for (contract_address, batch), result in zip(batches, results):
+        if isinstance(result, Exception):
+            sys.stdout.write(f"[EXCEPTION] Error processing {len(batch)} tokens from {contract_address}: {result}\n")
             sys.stdout.flush()
-            skipped_count += 1
+            skipped_count += len(batch)
+            continue
+        processed_count += sum(result)
+        skipped_count += len(result) - sum(result)
 
     sys.stdout.write(f"\n[SUMMARY] Processed: {processed_count}, Skipped: {skipped_count}\n")
     sys.stdout.flush()
@@ -245,7 +303,7 @@ The spreadsheet should contain NFT URLs in one of these formats:
     parser.add_argument('--start', type=int, default=1,
                        help='Row number to start from (default: 1, first row)')
     parser.add_argument('--count', type=int, default=None,
-                       help='Number of items to fetch (default: all)')
+                       help='Number of unique NFTs to queue for fetching (default: all); duplicates are skipped and failed fetches are not replaced')
 
     args = parser.parse_args()
 
@@ -257,11 +315,9 @@ The spreadsheet should contain NFT URLs in one of these formats:
     # Convert Google Sheets URL to CSV export URL
     csv_url = convert_to_csv_url(args.url)
 
-    # Fetch CSV data
-    csv_data = fetch_csv_data(csv_url)
-
-    # Process rows
-    process_rows(csv_data, start_row=args.start, count=args.count)
+    # Stream CSV data and process rows as they arrive
+    with fetch_csv_data(csv_url) as csv_data:
+        asyncio.run(process_rows(csv_data, start_row=args.start, count=args.count))
 
     sys.stdout.write("\n[INFO] Done!\n")
     sys.stdout.flush()